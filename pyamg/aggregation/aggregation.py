@@ -4,6 +4,7 @@ from __future__ import absolute_import
 __docformat__ = "restructuredtext en"
 
 from warnings import warn
+import hashlib
 import numpy as np
 from scipy.sparse import csr_matrix, isspmatrix_csr, isspmatrix_bsr,\
     SparseEfficiencyWarning
@@ -11,7 +12,8 @@ from scipy.sparse import csr_matrix, isspmatrix_csr, isspmatrix_bsr,\
 from pyamg.multilevel import multilevel_solver
 from pyamg.relaxation.smoothing import change_smoothers
 from pyamg.util.utils import relaxation_as_linear_operator,\
-    eliminate_diag_dom_nodes, blocksize,\
+    eliminate_diag_dom_nodes, blocksize, constant_candidates,\
+    hermitian_transpose,\
     levelize_strength_or_aggregation, levelize_smooth_or_improve_candidates, \
     mat_mat_complexity, unpack_arg
 from pyamg.strength import classical_strength_of_connection,\
@@ -20,7 +22,7 @@ from pyamg.strength import classical_strength_of_connection,\
     algebraic_distance, affinity_distance
 from .aggregate import standard_aggregation, naive_aggregation,\
     lloyd_aggregation
-from .tentative import fit_candidates
+from .tentative import fit_candidates, fit_constant_candidates
 from .smooth import jacobi_prolongation_smoother,\
     richardson_prolongation_smoother, energy_prolongation_smoother
 
@@ -41,7 +43,8 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
                                                     None],
                                 max_levels = 10, max_coarse = 10,
                                 diagonal_dominance=False,
-                                keep=False, **kwargs):
+                                keep=False, same_A_strength_cache=None,
+                                fp32_setup=False, **kwargs):
     """
     Create a multilevel solver using classical-style Smoothed Aggregation (SA)
 
@@ -112,6 +115,27 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
         Flag to indicate keeping extra operators in the hierarchy for
         diagnostics.  For example, if True, then strength of connection (C),
         tentative prolongation (T), and aggregation (AggOp) are kept.
+    same_A_strength_cache : {None, dict} : default None
+        If a dict, strength of connection matrices are stored in, and reused
+        from, same_A_strength_cache across calls with an identical operator.
+        A strength matrix is reused only if the entries of A, the strength
+        parameters and, for evolution strength, the candidates B are
+        unchanged on that level.  This is useful when repeating the setup
+        for the same A while varying other parameters, e.g., the smoother
+        or aggregation options.  It gives no benefit when the values of A
+        change, even if its sparsity pattern is fixed, and each lookup costs
+        a hash of A (and of B for evolution strength) on every level.  Only
+        'evolution' (or 'ode') and 'energy_based' strength are cached.  The
+        other methods cost about as much as hashing A, and
+        'algebraic_distance' draws random vectors, so that a cache hit would
+        change the random state seen by the rest of the setup.  Strength
+        methods with array-valued parameters are not cached.
+    fp32_setup : {bool} : default False
+        If True and A is double precision, then candidate improvement,
+        tentative prolongation and prolongation smoothing are carried out in
+        single precision, which halves the memory traffic of these steps.  The
+        resulting P and R, and the coarse grid operators, are returned in the
+        precision of A.  Intended for large, well-conditioned problems.
 
     Other Parameters
     ----------------
@@ -239,9 +263,11 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
         raise ValueError('expected square matrix')
 
     # Right near nullspace candidates use constant for each variable as default
+    # If improve_candidates is None on level 0, these are fit without local
+    # QR, see fit_constant_candidates
+    constant_B = (B is None) and (symmetry != 'nonsymmetric' or BH is None)
     if B is None:
-        B = np.kron(np.ones((int(A.shape[0]/blocksize(A)), 1), dtype=A.dtype),
-                    np.eye(blocksize(A)))
+        B = constant_candidates(A)
     else:
         B = np.asarray(B, dtype=A.dtype)
         if len(B.shape) == 1:
@@ -278,6 +304,14 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
         levelize_smooth_or_improve_candidates(improve_candidates, max_levels)
     smooth = levelize_smooth_or_improve_candidates(smooth, max_levels)
 
+    # Unpack each level's (fn, kwargs) descriptor once, so that
+    # extend_hierarchy can index these lists directly
+    strength = [unpack_arg(v, cost=False) for v in strength]
+    aggregate = [unpack_arg(v, cost=False) for v in aggregate]
+    improve_candidates = [unpack_arg(v, cost=False)
+                          for v in improve_candidates]
+    smooth = [unpack_arg(v, cost=False) for v in smooth]
+
     # Construct multilevel structure
     levels = []
     levels.append(multilevel_solver.level())
@@ -291,7 +325,10 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     while len(levels) < max_levels and\
             int(levels[-1].A.shape[0]/blocksize(levels[-1].A)) > max_coarse:
         extend_hierarchy(levels, strength, aggregate, smooth,
-                         improve_candidates, diagonal_dominance, keep)
+                         improve_candidates, diagonal_dominance, keep,
+                         constant_B=(constant_B and len(levels) == 1),
+                         same_A_strength_cache=same_A_strength_cache,
+                         fp32_setup=fp32_setup)
 
     # Construct and return multilevel hierarchy
     ml = multilevel_solver(levels, **kwargs)
@@ -299,23 +336,77 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     return ml
 
 
+def same_A_strength_key(A, B, fn, kwargs):
+    """Return the key used to store the strength of connection for A in a
+    same_A_strength_cache, or None if this strength method is not cached.
+    """
+
+    # Computing the key hashes all of A, which costs about as much as the
+    # cheap strength methods themselves.  algebraic_distance is not cached,
+    # because skipping it would change the random state for the rest of setup
+    if fn not in ('ode', 'evolution', 'energy_based'):
+        return None
+
+    params = []
+    for name in sorted(kwargs):
+        if name == 'cost':
+            continue
+        if not isinstance(kwargs[name], (bool, int, float, complex, str)):
+            return None
+        params.append((name, kwargs[name]))
+
+    # the same A may be seen with unsorted and sorted indices, so hash a
+    # sorted copy rather than sorting the user's matrix in place
+    if not A.has_sorted_indices:
+        A = A.sorted_indices()
+    arrays = [A.indptr, A.indices, A.data]
+    if (fn == 'ode') or (fn == 'evolution'):
+        arrays.append(B)
+
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array))
+
+    return (fn, tuple(params), A.format, A.shape, blocksize(A), A.dtype.str,
+            digest.hexdigest())
+
+
 def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
-                     diagonal_dominance=False, keep=True):
+                     diagonal_dominance=False, keep=True, constant_B=False,
+                     same_A_strength_cache=None, fp32_setup=False):
     """Service routine to implement the strength of connection, aggregation,
     tentative prolongation construction, and prolongation smoothing.  Called by
     smoothed_aggregation_solver.
+
+    The parameters strength, aggregate, smooth and improve_candidates are
+    lists of unpacked (fn, kwargs) tuples, where entry i describes level i.
+    If constant_B is True, then B (and BH) are the default constant
+    candidates, and the tentative prolongator is formed without local QR.
+    If same_A_strength_cache is a dict, then C is looked up in, and stored
+    to, same_A_strength_cache.  If fp32_setup is True, then B, T and P are
+    computed in single precision and cast back to the precision of A.
     """
 
-    A = levels[-1].A
-    B = levels[-1].B
+    lvl = len(levels) - 1
+    level = levels[-1]
+    A = level.A
+    B = level.B
     if A.symmetry == "nonsymmetric":
-        AH = A.H.asformat(A.format)
-        BH = levels[-1].BH
+        # A.H is only formed if needed to relax BH or to smooth R
+        AH = None
+        BH = level.BH
 
     # Compute the strength-of-connection matrix C, where larger
     # C[i,j] denote stronger couplings between i and j.
-    fn, kwargs = unpack_arg(strength[len(levels)-1])
-    if fn == 'symmetric':
+    fn, kwargs = strength[lvl]
+    kwargs['cost'] = [0.0]
+    cache_key = None
+    if same_A_strength_cache is not None:
+        cache_key = same_A_strength_key(A, B, fn, kwargs)
+
+    if (cache_key is not None) and (cache_key in same_A_strength_cache):
+        C = same_A_strength_cache[cache_key]
+    elif fn == 'symmetric':
         C = symmetric_strength_of_connection(A, **kwargs)
     elif fn == 'classical':
         C = classical_strength_of_connection(A, **kwargs)
@@ -340,18 +431,22 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         raise ValueError('unrecognized strength of connection method: %s' %
                          str(fn))
 
-    levels[-1].complexity['strength'] = kwargs['cost'][0]
+    if cache_key is not None:
+        same_A_strength_cache[cache_key] = C
+
+    level.complexity['strength'] = kwargs['cost'][0]
  
     # Avoid coarsening diagonally dominant rows
     flag, kwargs = unpack_arg(diagonal_dominance)
     if flag:
         C = eliminate_diag_dom_nodes(A, C, **kwargs)
-        levels[-1].complexity['diag_dom'] = kwargs['cost'][0]
+        level.complexity['diag_dom'] = kwargs['cost'][0]
 
     # Compute the aggregation matrix AggOp (i.e., the nodal coarsening of A).
     # AggOp is a boolean matrix, where the sparsity pattern for the k-th column
     # denotes the fine-grid nodes agglomerated into k-th coarse-grid node.
-    fn, kwargs = unpack_arg(aggregate[len(levels)-1])
+    fn, kwargs = aggregate[lvl]
+    kwargs['cost'] = [0.0]
     if fn == 'standard':
         AggOp = standard_aggregation(C, **kwargs)[0]
     elif fn == 'naive':
@@ -363,40 +458,68 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     else:
         raise ValueError('unrecognized aggregation method %s' % str(fn))
 
-    levels[-1].complexity['aggregation'] = kwargs['cost'][0] * (float(C.nnz)/A.nnz)
+    level.complexity['aggregation'] = kwargs['cost'][0] * (float(C.nnz)/A.nnz)
+
+    # Carry out the remaining setup, save for the Galerkin product, on a
+    # single precision copy of the operator
+    dtype = A.dtype
+    A_setup = A
+    if fp32_setup and (dtype == np.float64 or dtype == np.complex128):
+        if dtype.kind == 'c':
+            A_setup = A.astype(np.complex64)
+        else:
+            A_setup = A.astype(np.float32)
+        B = B.astype(A_setup.dtype)
+        if A.symmetry == "nonsymmetric":
+            BH = BH.astype(A_setup.dtype)
 
     # Improve near nullspace candidates by relaxing on A B = 0
     temp_cost = [0.0]
-    fn, kwargs = unpack_arg(improve_candidates[len(levels)-1], cost=False)
+    fn, kwargs = improve_candidates[lvl]
     if fn is not None:
-        b = np.zeros((A.shape[0], 1), dtype=A.dtype)
-        B = relaxation_as_linear_operator((fn, kwargs), A, b, temp_cost) * B
-        levels[-1].B = B
+        # The zero right-hand side is shared by the relaxations on A and A.H
+        b = np.zeros((A.shape[0], 1), dtype=A_setup.dtype)
+        B = relaxation_as_linear_operator((fn, kwargs), A_setup, b,
+                                          temp_cost) * B
+        level.B = B.astype(dtype, copy=False)
         if A.symmetry == "nonsymmetric":
-            BH = relaxation_as_linear_operator((fn, kwargs), AH, b, temp_cost) * BH
-            levels[-1].BH = BH
+            AH = hermitian_transpose(A_setup)
+            BH = relaxation_as_linear_operator((fn, kwargs), AH, b,
+                                               temp_cost) * BH
+            level.BH = BH.astype(dtype, copy=False)
+        del b
+        constant_B = False
 
-    levels[-1].complexity['candidates'] = temp_cost[0] * B.shape[1]
+    level.complexity['candidates'] = temp_cost[0] * B.shape[1]
 
     # Compute the tentative prolongator, T, which is a tentative interpolation
     # matrix from the coarse-grid to the fine-grid.  T exactly interpolates
     # B_fine = T B_coarse. Orthogonalization complexity ~ 2nk^2, k=B.shape[1].
     temp_cost=[0.0]
-    T, B = fit_candidates(AggOp, B, cost=temp_cost)
-    if A.symmetry == "nonsymmetric":
-        TH, BH = fit_candidates(AggOp, BH, cost=temp_cost)
+    if constant_B:
+        T, B = fit_constant_candidates(AggOp, blocksize(A), dtype=B.dtype,
+                                       cost=temp_cost)
+        if A.symmetry == "nonsymmetric":
+            TH, BH = T, B.copy()
+    else:
+        AggOp_csc = AggOp.tocsc()
+        T, B = fit_candidates(AggOp, B, AggOp_csc=AggOp_csc, cost=temp_cost)
+        if A.symmetry == "nonsymmetric":
+            TH, BH = fit_candidates(AggOp, BH, AggOp_csc=AggOp_csc,
+                                    cost=temp_cost)
 
-    levels[-1].complexity['tentative'] = temp_cost[0]/A.nnz
+    level.complexity['tentative'] = temp_cost[0]/A.nnz
 
     # Smooth the tentative prolongator, so that it's accuracy is greatly
     # improved for algebraically smooth error.
-    fn, kwargs = unpack_arg(smooth[len(levels)-1])
+    fn, kwargs = smooth[lvl]
+    kwargs['cost'] = [0.0]
     if fn == 'jacobi':
-        P = jacobi_prolongation_smoother(A, T, C, B, **kwargs)
+        P = jacobi_prolongation_smoother(A_setup, T, C, B, **kwargs)
     elif fn == 'richardson':
-        P = richardson_prolongation_smoother(A, T, **kwargs)
+        P = richardson_prolongation_smoother(A_setup, T, **kwargs)
     elif fn == 'energy':
-        P = energy_prolongation_smoother(A, T, C, B, None, (False, {}),
+        P = energy_prolongation_smoother(A_setup, T, C, B, None, (False, {}),
                                          **kwargs)
     elif fn is None:
         P = T
@@ -404,7 +527,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         raise ValueError('unrecognized prolongation smoother method %s' %
                          str(fn))
 
-    levels[-1].complexity['smooth_P'] = kwargs['cost'][0]
+    level.complexity['smooth_P'] = kwargs['cost'][0]
 
     # Compute the restriction matrix, R, which interpolates from the fine-grid
     # to the coarse-grid.  If A is nonsymmetric, then R must be constructed
@@ -415,7 +538,10 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     elif symmetry == 'symmetric':
         R = P.T
     elif symmetry == 'nonsymmetric':
-        fn, kwargs = unpack_arg(smooth[len(levels)-1])
+        fn, kwargs = smooth[lvl]
+        kwargs['cost'] = [0.0]
+        if (fn is not None) and (AH is None):
+            AH = hermitian_transpose(A_setup)
         if fn == 'jacobi':
             R = jacobi_prolongation_smoother(AH, TH, C, BH, **kwargs).H
         elif fn == 'richardson':
@@ -429,26 +555,36 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         else:
             raise ValueError('unrecognized prolongation smoother method %s' %
                              str(fn))
-        levels[-1].complexity['smooth_R'] = kwargs['cost'][0]
+        level.complexity['smooth_R'] = kwargs['cost'][0]
+
+    if A_setup is not A:
+        T = T.astype(dtype)
+        P = P.astype(dtype)
+        R = R.astype(dtype)
+        B = B.astype(dtype)
+        if A.symmetry == "nonsymmetric":
+            BH = BH.astype(dtype)
 
     if keep:
-        levels[-1].C = C            # strength of connection matrix
-        levels[-1].AggOp = AggOp    # aggregation operator
-        levels[-1].T = T            # tentative prolongator
+        level.C = C            # strength of connection matrix
+        level.AggOp = AggOp    # aggregation operator
+        level.T = T            # tentative prolongator
 
-    levels[-1].P = P  # smoothed prolongator
-    levels[-1].R = R  # restriction operator
+    level.P = P  # smoothed prolongator
+    level.R = R  # restriction operator
 
     # Form coarse grid operator, get complexity
-    levels[-1].complexity['RAP'] = mat_mat_complexity(R,A) / float(A.nnz)
+    level.complexity['RAP'] = mat_mat_complexity(R,A) / float(A.nnz)
     RA = R * A
-    levels[-1].complexity['RAP'] += mat_mat_complexity(RA,P) / float(A.nnz)
+    level.complexity['RAP'] += mat_mat_complexity(RA,P) / float(A.nnz)
     A = RA * P      # Galerkin operator, Ac = RAP
     A.symmetry = symmetry
 
-    levels.append(multilevel_solver.level())
-    levels[-1].A = A
-    levels[-1].B = B           # right near nullspace candidates
+    coarse = multilevel_solver.level()
+    coarse.A = A
+    coarse.B = B               # right near nullspace candidates
 
     if A.symmetry == "nonsymmetric":
-        levels[-1].BH = BH     # left near nullspace candidates
+        coarse.BH = BH         # left near nullspace candidates
+
+    levels.append(coarse)
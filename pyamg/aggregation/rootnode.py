@@ -12,7 +12,8 @@ from pyamg.multilevel import multilevel_solver
 from pyamg.relaxation.smoothing import change_smoothers
 from pyamg.util.utils import relaxation_as_linear_operator,\
     scale_T, get_Cpt_params, \
-    eliminate_diag_dom_nodes, blocksize, \
+    eliminate_diag_dom_nodes, blocksize, constant_candidates, \
+    hermitian_transpose, \
     levelize_strength_or_aggregation, \
     levelize_smooth_or_improve_candidates, \
     mat_mat_complexity, unpack_arg
@@ -264,8 +265,7 @@ def rootnode_solver(A, B=None, BH=None,
 
     # Right near nullspace candidates use constant for each variable as default
     if B is None:
-        B = np.kron(np.ones((int(A.shape[0]/blocksize(A)), 1), dtype=A.dtype),
-                    np.eye(blocksize(A)))
+        B = constant_candidates(A)
     else:
         B = np.asarray(B, dtype=A.dtype)
         if len(B.shape) == 1:
@@ -332,7 +332,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     A = levels[-1].A
     B = levels[-1].B
     if A.symmetry == "nonsymmetric":
-        AH = A.H.asformat(A.format)
+        AH = hermitian_transpose(A)
         BH = levels[-1].BH
 
     # Compute the strength-of-connection matrix C, where larger
@@ -407,10 +407,13 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     # B_fine[:, 0:blocksize(A)] = T B_coarse[:, 0:blocksize(A)].
     # Orthogonalization complexity ~ 2nk^2, k = blocksize(A).
     temp_cost=[0.0]
-    T, dummy = fit_candidates(AggOp, B[:, 0:blocksize(A)], cost=temp_cost)
+    AggOp_csc = AggOp.tocsc()
+    T, dummy = fit_candidates(AggOp, B[:, 0:blocksize(A)], AggOp_csc=AggOp_csc,
+                              cost=temp_cost)
     del dummy
     if A.symmetry == "nonsymmetric":
-        TH, dummyH = fit_candidates(AggOp, BH[:, 0:blocksize(A)], cost=temp_cost)
+        TH, dummyH = fit_candidates(AggOp, BH[:, 0:blocksize(A)],
+                                    AggOp_csc=AggOp_csc, cost=temp_cost)
         del dummyH
 
     levels[-1].complexity['tentative'] = temp_cost[0]/A.nnz
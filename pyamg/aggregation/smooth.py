@@ -96,9 +96,10 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         complexity.
     weighting : {string}
         'block', 'diagonal' or 'local' weighting for constructing the Jacobi D
-        'local': Uses a local row-wise weight based on the Gershgorin estimate.
-          Avoids any potential under-damping due to inaccurate spectral radius
-          estimates.
+        'local': Uses a local row-wise weight based on the Gershgorin estimate,
+          i.e., l1-Jacobi with D_ii = sum_j |S_ij|.  Avoids any potential
+          under-damping due to inaccurate spectral radius estimates, and
+          requires no spectral radius estimate at all.
         'block': If A is a BSR matrix, use a block diagonal inverse of A
         'diagonal': Classic Jacobi D = diagonal(A)
 
@@ -162,9 +163,10 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         else:
             numPDEs = 1
 
-        # Create a filtered S with entries dropped that aren't in C
+        # Create a filtered S with entries dropped that aren't in C.  UnAmal
+        # returns a double precision pattern, so keep the precision of S.
         C = UnAmal(C, numPDEs, numPDEs)
-        S = S.multiply(C)
+        S = S.multiply(C).astype(S.dtype, copy=False)
         S.eliminate_zeros()
         cost[0] += 1.0
 
@@ -187,10 +189,21 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         cost[0] += 17
     elif weighting == 'local':
         # Use the Gershgorin estimate as each row's weight, instead of a global
-        # spectral radius estimate
-        D = np.abs(S)*np.ones((S.shape[0], 1), dtype=S.dtype)
-        D_inv = np.zeros_like(D)
-        D_inv[D != 0] = 1.0 / np.abs(D[D != 0])
+        # spectral radius estimate.  The absolute row sums are accumulated
+        # directly from S.data, without forming abs(S) or an SpMV.
+        if sparse.isspmatrix_bsr(S):
+            RowsPerBlock = S.blocksize[0]
+            absdata = np.abs(S.data).sum(axis=2)
+        else:
+            RowsPerBlock = 1
+            absdata = np.abs(S.data).reshape(-1, 1)
+        rows = np.repeat(np.arange(S.indptr.shape[0] - 1),
+                         np.diff(S.indptr))
+        rows = (RowsPerBlock*rows.reshape(-1, 1) +
+                np.arange(RowsPerBlock)).ravel()
+        D = np.bincount(rows, weights=absdata.ravel(), minlength=S.shape[0])
+        D_inv = np.zeros((S.shape[0],), dtype=S.dtype)
+        D_inv[D != 0] = 1.0 / D[D != 0]
 
         D_inv_S = scale_rows(S, D_inv, copy=True)
         D_inv_S = omega*D_inv_S
@@ -6,10 +6,10 @@ import numpy as np
 from scipy.sparse import isspmatrix_csr, bsr_matrix
 from pyamg import amg_core
 
-__all__ = ['fit_candidates']
+__all__ = ['fit_candidates', 'fit_constant_candidates']
 
 
-def fit_candidates(AggOp, B, tol=1e-10, cost=[0.0]):
+def fit_candidates(AggOp, B, tol=1e-10, cost=[0.0], AggOp_csc=None):
     """Fit near-nullspace candidates to form the tentative prolongator
 
     Parameters
@@ -26,6 +26,10 @@ def fit_candidates(AggOp, B, tol=1e-10, cost=[0.0]):
         i.e. ||Q[:, j]|| < tol, then Q[:, j] is set to zero.
     cost : {list containing one scalar}
         cost[0] is incremented to reflect a FLOP estimate for this function
+    AggOp_csc : {None, csc_matrix}
+        AggOp in CSC format, i.e., AggOp.tocsc().  The fit traverses AggOp
+        by aggregate, so pass this to avoid converting AggOp again when
+        fitting several sets of candidates to the same aggregation.
 
     Returns
     -------
@@ -142,7 +146,10 @@ def fit_candidates(AggOp, B, tol=1e-10, cost=[0.0]):
     R = np.empty((N_coarse, K2, K2), dtype=B.dtype)  # coarse candidates
     Qx = np.empty((AggOp.nnz, K1, K2), dtype=B.dtype)  # BSR data array
 
-    AggOp_csc = AggOp.tocsc()
+    if AggOp_csc is None:
+        AggOp_csc = AggOp.tocsc()
+    elif AggOp_csc.shape != AggOp.shape:
+        raise ValueError('dimensions of AggOp and AggOp_csc are incompatible')
 
     fn = amg_core.fit_candidates
     fn(N_fine, N_coarse, K1, K2,
@@ -158,3 +165,87 @@ def fit_candidates(AggOp, B, tol=1e-10, cost=[0.0]):
     cost[0] += 2.0*B.shape[1]*B.shape[1]*float(Q.shape[0])
 
     return Q, R
+
+
+def fit_constant_candidates(AggOp, blocksize=1, dtype='float64', cost=[0.0]):
+    """Form the tentative prolongator for the default, constant candidates
+
+    This is equivalent to fit_candidates(AggOp, B), where B is the default
+    candidate set np.kron(np.ones((N_fine, 1)), np.eye(blocksize)), but
+    avoids the local QR factorizations.  Each such candidate is constant
+    over an aggregate, so the local QR simply scales by the aggregate size.
+
+    Parameters
+    ----------
+    AggOp : csr_matrix
+        Describes the sparsity pattern of the tentative prolongator.
+        Has dimension (#blocks, #aggregates)
+    blocksize : int
+        Number of degrees-of-freedom per supernode, i.e., the number of
+        constant candidates
+    dtype : dtype
+        dtype of the returned prolongator and coarse candidates
+    cost : {list containing one scalar}
+        cost[0] is incremented to reflect a FLOP estimate for this function
+
+    Returns
+    -------
+    (Q, R) : (bsr_matrix, array)
+        As for fit_candidates, Q has dimensions (#blocks * blocksize,
+        #aggregates * blocksize) and R has dimensions (#aggregates *
+        blocksize, blocksize).
+
+    Notes
+    -----
+    smoothed_aggregation_solver uses this function only on the finest level,
+    when B is None (and BH is None for nonsymmetric A) and improve_candidates
+    is None on that level.  The default improve_candidates relaxes B with
+    block_gauss_seidel, so the candidates are no longer constant and the
+    default solver uses fit_candidates.
+
+    See Also
+    --------
+    fit_candidates
+
+    Examples
+    --------
+    >>> from scipy.sparse import csr_matrix
+    >>> from pyamg.aggregation.tentative import fit_constant_candidates
+    >>> AggOp = csr_matrix( [[1, 0],
+    ...                      [1, 0],
+    ...                      [0, 1],
+    ...                      [0, 1]] )
+    >>> Q, R = fit_constant_candidates(AggOp)
+    >>> Q.todense()
+    matrix([[ 0.70710678,  0.        ],
+            [ 0.70710678,  0.        ],
+            [ 0.        ,  0.70710678],
+            [ 0.        ,  0.70710678]])
+    >>> R
+    array([[ 1.41421356],
+           [ 1.41421356]])
+
+    """
+    if not isspmatrix_csr(AggOp):
+        raise TypeError('expected csr_matrix for argument AggOp')
+
+    N_fine, N_coarse = AggOp.shape
+    K = int(blocksize)
+
+    # Aggregate sizes, counted from the sparsity pattern of AggOp
+    sizes = np.bincount(AggOp.indices, minlength=N_coarse).astype(dtype)
+    sqrt_sizes = np.sqrt(sizes)
+
+    # The local Q for aggregate j is eye(K)/sqrt(size_j) on each member block
+    Qx = np.zeros((AggOp.nnz, K, K), dtype=dtype)
+    scale = 1.0 / sqrt_sizes[AggOp.indices]
+    for k in range(K):
+        Qx[:, k, k] = scale
+
+    Q = bsr_matrix((Qx, AggOp.indices.copy(), AggOp.indptr.copy()),
+                   shape=(K*N_fine, K*N_coarse))
+    R = np.kron(sqrt_sizes.reshape(-1, 1), np.eye(K, dtype=dtype))
+
+    cost[0] += float(Q.shape[0])
+
+    return Q, R
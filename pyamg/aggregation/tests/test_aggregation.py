@@ -3,14 +3,16 @@ import scipy as sp
 import scipy.sparse
 from scipy.sparse import csr_matrix, SparseEfficiencyWarning
 
-from pyamg.util.utils import diag_sparse
+from pyamg.util.utils import diag_sparse, constant_candidates
 from pyamg.gallery import poisson, linear_elasticity,\
     gauge_laplacian, load_example
 
-from pyamg.aggregation.aggregation import smoothed_aggregation_solver
+from pyamg.aggregation.aggregation import smoothed_aggregation_solver,\
+    same_A_strength_key
+from pyamg.aggregation.tentative import fit_candidates
 
 from numpy.testing import TestCase, assert_approx_equal,\
-    assert_array_almost_equal
+    assert_array_almost_equal, assert_equal
 
 import warnings
 warnings.simplefilter('ignore', SparseEfficiencyWarning)
@@ -86,6 +88,120 @@ class TestParameters(TestCase):
         for dd in diagonal_dominance:
             self.run_cases({'diagonal_dominance': dd})
 
+    def test_same_A_strength_cache(self):
+        for A, B in self.cases:
+            # cheap strength methods are not cached
+            cache = {}
+            smoothed_aggregation_solver(A, B, max_coarse=5,
+                                        strength='symmetric',
+                                        same_A_strength_cache=cache)
+            assert_equal(cache, {})
+
+            # neither is algebraic_distance, which draws random vectors
+            assert_equal(same_A_strength_key(A, B, 'algebraic_distance', {}),
+                         None)
+
+            cache = {}
+            ml1 = smoothed_aggregation_solver(A, B, max_coarse=5, keep=True,
+                                              strength='evolution',
+                                              same_A_strength_cache=cache)
+            ml2 = smoothed_aggregation_solver(A, B, max_coarse=5, keep=True,
+                                              strength='evolution',
+                                              same_A_strength_cache=cache)
+            assert(ml1.levels[0].C is ml2.levels[0].C)
+            assert(ml2.levels[0].complexity['strength'] == 0.0)
+
+            # the same A with unsorted indices has the same key, and is not
+            # sorted by same_A_strength_key
+            Au = A.copy()
+            for i in range(Au.indptr.shape[0] - 1):
+                row = slice(Au.indptr[i], Au.indptr[i+1])
+                Au.indices[row] = Au.indices[row][::-1]
+                Au.data[row] = Au.data[row][::-1]
+            Au.has_sorted_indices = False
+            indices = Au.indices.copy()
+            assert_equal(same_A_strength_key(Au, B, 'energy_based', {}),
+                         same_A_strength_key(A, B, 'energy_based', {}))
+            assert_equal(Au.indices, indices)
+            assert(not Au.has_sorted_indices)
+            ml2 = smoothed_aggregation_solver(Au, B, max_coarse=5, keep=True,
+                                              strength='evolution',
+                                              same_A_strength_cache=cache)
+            assert(ml1.levels[0].C is ml2.levels[0].C)
+
+            # the cache is only for an identical A, so new values on the
+            # same sparsity pattern miss the cache, and still give a correct
+            # hierarchy
+            A2 = A.copy()
+            A2.data *= 2.0
+            assert_equal(A2.indptr, A.indptr)
+            assert_equal(A2.indices, A.indices)
+            nkeys = len(cache)
+            np.random.seed(0)
+            ml3 = smoothed_aggregation_solver(A2, B, max_coarse=5,
+                                              keep=True, strength='evolution',
+                                              same_A_strength_cache=cache)
+            np.random.seed(0)
+            ml4 = smoothed_aggregation_solver(A2, B, max_coarse=5,
+                                              keep=True, strength='evolution')
+            assert(len(cache) > nkeys)
+            assert(ml3.levels[0].C is not ml1.levels[0].C)
+            assert(ml3.levels[0].complexity['strength'] > 0.0)
+            assert_array_almost_equal(ml3.levels[0].C.todense(),
+                                      ml4.levels[0].C.todense())
+
+            np.random.seed(0)
+            x = sp.rand(A.shape[0])
+            b = A * sp.rand(A.shape[0])
+            residuals = []
+            ml3.solve(b, x0=x, maxiter=30, tol=1e-10, residuals=residuals)
+            convergence_ratio =\
+                (residuals[-1] / residuals[0]) ** (1.0 / len(residuals))
+            assert(convergence_ratio < 0.9)
+
+    def test_fp32_setup(self):
+        self.run_cases({'fp32_setup': True})
+        self.run_cases({'fp32_setup': True, 'symmetry': 'nonsymmetric'})
+
+        # P, R and the coarse grid operators keep the precision of A, also
+        # when R is smoothed with A.H
+        for smooth in ['jacobi', ('jacobi', {'filter': True}), 'richardson',
+                       'energy']:
+            for A, B in self.cases:
+                for symmetry in ['symmetric', 'nonsymmetric']:
+                    ml = smoothed_aggregation_solver(A, B, max_coarse=5,
+                                                     symmetry=symmetry,
+                                                     smooth=smooth,
+                                                     fp32_setup=True)
+                    for lvl in ml.levels[:-1]:
+                        assert_equal(lvl.P.dtype, A.dtype)
+                        assert_equal(lvl.R.dtype, A.dtype)
+                    for lvl in ml.levels:
+                        assert_equal(lvl.A.dtype, A.dtype)
+
+    def test_constant_candidates(self):
+        # With B=None and no candidate improvement, the finest level is fit
+        # with fit_constant_candidates, which must agree with fit_candidates
+        # up to the sign of each column
+        for A, B in self.cases:
+            np.random.seed(0)
+            ml = smoothed_aggregation_solver(A, max_coarse=5, keep=True,
+                                             improve_candidates=None)
+            B = constant_candidates(A)
+            T, Bc = fit_candidates(ml.levels[0].AggOp, B)
+            assert_array_almost_equal(abs(ml.levels[0].T.todense()),
+                                      abs(T.todense()))
+            assert_array_almost_equal(abs(ml.levels[1].B), abs(Bc))
+
+            # the same setup with an explicit, constant B uses fit_candidates
+            np.random.seed(0)
+            ml2 = smoothed_aggregation_solver(A, B, max_coarse=5, keep=True,
+                                              improve_candidates=None)
+            assert_array_almost_equal(abs(ml.levels[0].P.todense()),
+                                      abs(ml2.levels[0].P.todense()))
+            assert_array_almost_equal(abs(ml.levels[1].B),
+                                      abs(ml2.levels[1].B))
+
 
 class TestComplexParameters(TestCase):
     def setUp(self):
@@ -164,6 +280,24 @@ class TestComplexParameters(TestCase):
         for dd in diagonal_dominance:
             self.run_cases({'diagonal_dominance': dd})
 
+    def test_fp32_setup(self):
+        self.run_cases({'fp32_setup': True, 'symmetry': 'nonsymmetric'})
+
+        # P, R and the coarse grid operators keep the precision of A, also
+        # when R is smoothed with A.H
+        for smooth in ['jacobi', ('jacobi', {'filter': True}), 'richardson',
+                       ('energy', {'krylov': 'gmres'})]:
+            for A, B in self.cases:
+                ml = smoothed_aggregation_solver(A, B, max_coarse=5,
+                                                 symmetry='nonsymmetric',
+                                                 smooth=smooth,
+                                                 fp32_setup=True)
+                for lvl in ml.levels[:-1]:
+                    assert_equal(lvl.P.dtype, A.dtype)
+                    assert_equal(lvl.R.dtype, A.dtype)
+                for lvl in ml.levels:
+                    assert_equal(lvl.A.dtype, A.dtype)
+
 
 class TestSolverPerformance(TestCase):
     def setUp(self):
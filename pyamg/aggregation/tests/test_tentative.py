@@ -2,6 +2,7 @@ import numpy as np
 from scipy.sparse import csr_matrix
 
 from pyamg.aggregation.aggregation import fit_candidates
+from pyamg.aggregation.tentative import fit_constant_candidates
 
 from numpy.testing import TestCase, assert_almost_equal
 
@@ -179,3 +180,29 @@ class TestFitCandidates(TestCase):
             # each fine level candidate should be fit (almost) exactly
             assert_almost_equal(fine_candidates, Q * coarse_candidates)
             assert_almost_equal(Q * (Q.H * fine_candidates), fine_candidates)
+
+    def test_constant_candidates(self):
+        AggOps = []
+        AggOps.append(csr_matrix((np.ones(5), np.array([0, 0, 0, 1, 1]),
+                                  np.arange(6)), shape=(5, 2)))
+        # aggregation excludes the third node
+        AggOps.append(csr_matrix((np.ones(4), np.array([1, 1, 0, 0]),
+                                  np.array([0, 1, 2, 2, 3, 4])), shape=(5, 2)))
+        AggOps.append(csr_matrix((np.ones(6), np.array([2, 0, 1, 0, 2, 2]),
+                                  np.arange(7)), shape=(6, 3)))
+
+        for AggOp in AggOps:
+            for K in [1, 2, 3]:
+                B = np.kron(np.ones((AggOp.shape[0], 1)), np.eye(K))
+                B[np.repeat(np.diff(AggOp.indptr) == 0, K), :] = 0
+
+                Q, R = fit_candidates(AggOp, B)
+                Qc, Rc = fit_constant_candidates(AggOp, K)
+
+                assert_almost_equal(Q.todense(), Qc.todense())
+                assert_almost_equal(R, Rc)
+
+                # a precomputed CSC copy of AggOp gives the same fit
+                Qs, Rs = fit_candidates(AggOp, B, AggOp_csc=AggOp.tocsc())
+                assert_almost_equal(Q.todense(), Qs.todense())
+                assert_almost_equal(R, Rs)
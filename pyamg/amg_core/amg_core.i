@@ -197,6 +197,7 @@ INSTANTIATE_INDEX_ONLY(connected_components)
 INSTANTIATE_INDEXDATA_COMPLEX(apply_householders)
 INSTANTIATE_INDEXDATA_COMPLEX(householder_hornerscheme)
 INSTANTIATE_INDEXDATA_COMPLEX(apply_givens)
+INSTANTIATE_INDEXDATA_COMPLEX(mgs_orthogonalize)
 INSTANTIATE_INDEXDATA(dense_GMRES)
 
 /*----------------------------------------------------------------------------
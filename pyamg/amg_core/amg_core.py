@@ -260,6 +260,15 @@ def apply_givens(*args):
     """
     return _amg_core.apply_givens(*args)
 
+def mgs_orthogonalize(*args):
+    """
+    mgs_orthogonalize(float const [] B, float [] x, float [] y, int const n, int const k)
+    mgs_orthogonalize(double const [] B, double [] x, double [] y, int const n, int const k)
+    mgs_orthogonalize(std::complex< float > const [] B, std::complex< float > [] x, std::complex< float > [] y, int const n, int const k)
+    mgs_orthogonalize(std::complex< double > const [] B, std::complex< double > [] x, std::complex< double > [] y, int const n, int const k)
+    """
+    return _amg_core.mgs_orthogonalize(*args)
+
 def dense_GMRES(*args):
     """
     dense_GMRES(float [] A, float [] b, float [] x, int const n, int const is_col_major, int maxiter=10, int precondition=1)
@@ -120,6 +120,58 @@ void householder_hornerscheme (      T z[], const int z_size,
 }
 
 
+/* Orthogonalize x against the first k columns of B with modified
+ * Gram-Schmidt
+ *
+ * Implements the below python
+ *
+ * for j in range(k):
+ *   alpha = dot(conjugate(B[:,j]), x)
+ *   y[j] = y[j] + alpha
+ *   x = x - alpha*B[:,j]
+ *
+ * Parameters
+ * ----------
+ * B : {float array}
+ *  n x m matrix of orthonormal vectors, m >= k
+ *  must be in column major form
+ * x : {float array}
+ *  length n vector to be orthogonalized
+ * y : {float array}
+ *  length >= k vector, the projection coefficients are added to y
+ * n : {int}
+ *  dimensionality of x
+ * k : {int}
+ *  number of columns of B to orthogonalize against
+ *
+ * Returns
+ * -------
+ * x and y are modified in place.  Because y is incremented, calling this
+ * routine twice re-orthogonalizes x and accumulates both sets of coefficients.
+ *
+ * Notes
+ * -----
+ * Principle calling routine is gmres_mgs(...) in krylov.py
+ */
+template<class I, class T, class F>
+void mgs_orthogonalize(const T B[], const int B_size,
+                             T x[], const int x_size,
+                             T y[], const int y_size,
+                       const I n,
+                       const I k)
+{
+    for(I j = 0; j < k; j++)
+    {
+        const T * Bj = &(B[j*n]);
+        T alpha = dot_prod(Bj, x, n);
+        y[j] += alpha;
+
+        for(I i = 0; i < n; i++)
+        {   x[i] -= alpha*Bj[i]; }
+    }
+}
+
+
 /* Apply the first nrot Givens rotations in B to x
  *
  * Parameters
@@ -8,6 +8,7 @@ import scipy as sp
 from scipy.sparse import isspmatrix_csr, isspmatrix_bsr, csr_matrix
 from pyamg import smoothed_aggregation_solver
 from pyamg.util.linalg import ishermitian, norm
+from pyamg.util.utils import constant_candidates
 
 __all__ = ['solve', 'solver', 'solver_configuration']
 
@@ -123,12 +124,7 @@ def solver_configuration(A, B=None, verb=True):
     # Determine near null-space modes B
     if B is None:
         # B is the constant for each variable in a node
-        if isspmatrix_bsr(A) and A.blocksize[0] > 1:
-            bsize = A.blocksize[0]
-            config['B'] = np.kron(np.ones((int(A.shape[0] / bsize), 1),
-                                  dtype=A.dtype), np.eye(bsize))
-        else:
-            config['B'] = np.ones((A.shape[0], 1), dtype=A.dtype)
+        config['B'] = constant_candidates(A)
     elif (isinstance(B, type(np.zeros((1,)))) or
             isinstance(B, type(sp.mat(np.zeros((1,)))))):
         if len(B.shape) == 1:
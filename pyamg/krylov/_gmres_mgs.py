@@ -1,48 +1,20 @@
 from __future__ import print_function
-from numpy import array, zeros, sqrt, ravel, abs, max, conjugate, real,\
+from numpy import array, zeros, ravel, abs, conjugate, dot, divide,\
     iscomplexobj
 from scipy.sparse.linalg._isolve.utils import make_system
 from scipy.sparse.sputils import upcast
-from scipy.linalg import get_blas_funcs, get_lapack_funcs
+from scipy.linalg import get_blas_funcs, get_lapack_funcs, solve_triangular
 from warnings import warn
-import scipy as sp
+from pyamg import amg_core
 
 __docformat__ = "restructuredtext en"
 
 __all__ = ['gmres_mgs']
 
 
-def apply_givens(Q, v, k):
-    '''
-    Apply the first k Givens rotations in Q to v
-
-    Parameters
-    ----------
-    Q : {list}
-        list of consecutive 2x2 Givens rotations
-    v : {array}
-        vector to apply the rotations to
-    k : {int}
-        number of rotations to apply.
-
-    Returns
-    -------
-    v is changed in place
-
-    Notes
-    -----
-    This routine is specialized for GMRES.  It assumes that the first Givens
-    rotation is for dofs 0 and 1, the second Givens rotation is for
-    dofs 1 and 2, and so on.
-    '''
-
-    for j in range(k):
-        Qloc = Q[j]
-        v[j:j+2] = sp.dot(Qloc, v[j:j+2])
-
-
 def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
-              M=None, callback=None, residuals=None, reorth=False):
+              M=None, callback=None, residuals=None, reorth=False, cgs=False,
+              inner_dtype=None):
     '''
     Generalized Minimum Residual Method (GMRES)
         GMRES iteratively refines the initial solution guess to the system
@@ -83,7 +55,22 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
         including the initial residual.
     reorth : boolean
         If True, then a check is made whether to re-orthogonalize the Krylov
-        space each GMRES iteration
+        space each GMRES iteration.  With cgs=True, every iteration is
+        re-orthogonalized, i.e., classical Gram-Schmidt is applied twice.
+    cgs : boolean
+        If True, then classical Gram-Schmidt is used instead of modified
+        Gram-Schmidt, so that each GMRES iteration orthogonalizes against the
+        Krylov space with two matrix-vector products (BLAS gemv), instead of
+        a dot product and an axpy for each Krylov vector.  Classical
+        Gram-Schmidt is less robust, and is best combined with reorth=True,
+        which doubles the cost of orthogonalization.
+    inner_dtype : dtype
+        If not None, the precision used to store and orthogonalize the Krylov
+        basis, e.g., numpy.float32 (the complex type of that precision is used
+        for complex systems).  H, the Givens rotations and the residual are
+        still computed in xtype, and the true residual is recomputed at each
+        restart, so that restarting corrects for the lower precision basis.
+        Default is to store the basis in xtype.
 
     Returns
     -------
@@ -107,7 +94,8 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
           still supported as a legacy.
         - For robustness, modified Gram-Schmidt is used to orthogonalize the
           Krylov Space Givens Rotations are used to provide the residual norm
-          each iteration
+          each iteration.  Classical Gram-Schmidt, with optional
+          re-orthogonalization, is available with cgs=True.
 
     Examples
     --------
@@ -129,6 +117,10 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
 
     .. [2] C. T. Kelley, http://www4.ncsu.edu/~ctk/matlab_roots.html
     '''
+    # Without a preconditioner, make_system returns an identity M, which
+    # need not be applied
+    precondition = (M is not None) or hasattr(A, 'psolve')
+
     # Convert inputs to linear system, with error checking
     A, M, x, b, postprocess = make_system(A, M, x0, b)
     dimen = A.shape[0]
@@ -147,26 +139,34 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
     else:
         Mtype = M.dtype
     xtype = upcast(Atype, x.dtype, b.dtype, Mtype)
+    # x is updated in place, e.g., a real system with a complex M has
+    # complex updates
+    x = x.astype(xtype, copy=False)
 
     if restrt is not None:
         restrt = int(restrt)
     if maxiter is not None:
         maxiter = int(maxiter)
 
-    # Get fast access to underlying BLAS routines
-    # dotc is the conjugate dot, dotu does no conjugation
-    [lartg] = get_lapack_funcs(['lartg'], [x] )
-    if iscomplexobj(zeros((1,), dtype=xtype)):
-        [axpy, dotu, dotc, scal] =\
-            get_blas_funcs(['axpy', 'dotu', 'dotc', 'scal'], [x])
+    # Precision of the Krylov basis
+    if inner_dtype is None:
+        vtype = xtype
+    elif iscomplexobj(zeros((1,), dtype=xtype)):
+        vtype = upcast(inner_dtype, 'F')
     else:
-        # real type
-        [axpy, dotu, dotc, scal] =\
-            get_blas_funcs(['axpy', 'dot', 'dot',  'scal'], [x])
+        vtype = upcast(inner_dtype)
 
-    # Make full use of direct access to BLAS by defining own norm
-    def norm(z):
-        return sqrt(real(dotc(z, z)))
+    # Get fast access to underlying BLAS routines
+    # nrm2 is the 2-norm, scaled to avoid overflow and underflow.  The v
+    # prefixed routines act on Krylov vectors, i.e., in precision vtype
+    [lartg] = get_lapack_funcs(['lartg'], [x] )
+    [nrm2] = get_blas_funcs(['nrm2'], dtype=xtype)
+    [vscal, vnrm2] = get_blas_funcs(['scal', 'nrm2'], dtype=vtype)
+    if cgs:
+        [gemv] = get_blas_funcs(['gemv'], dtype=vtype)
+    # Local names for the amg_core kernels called in the inner loop
+    mgs_orthogonalize = amg_core.mgs_orthogonalize
+    apply_givens = amg_core.apply_givens
 
     # Should norm(r) be kept
     if residuals == []:
@@ -204,8 +204,9 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
     r = b - ravel(A*x)
 
     # Apply preconditioner
-    r = ravel(M*r)
-    normr = norm(r)
+    if precondition:
+        r = ravel(M*r)
+    normr = nrm2(r)
     if keep_r:
         residuals.append(normr)
     # Check for nan, inf
@@ -215,12 +216,12 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
 
     # Check initial guess ( scaling by b, if b != 0,
     #   must account for case when norm(b) is very small)
-    normb = norm(b)
+    normb = nrm2(b)
     if normb == 0.0:
         normb = 1.0
     if normr < tol*normb:
         if callback is not None:
-            callback(norm(r))
+            callback(nrm2(r))
         return (postprocess(x), 0)
 
     # Scale tol by ||r_0||_2, we use the preconditioned residual
@@ -233,87 +234,125 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
     # error could cause the inner loop to halt while the actual ||r|| > tol.
     niter = 0
 
+    # Preallocate for Givens Rotations, Hessenberg matrix and Krylov Space
+    # Space required is O(dimen*max_inner).  These are allocated once and
+    # reset at each restart.
+    # NOTE:  H and V are stored in Fortran order, so that each new column
+    #        of H, each Krylov vector and each leading block V[:, :k] is
+    #        contiguous.
+    Q = zeros((4*max_inner,), dtype=xtype)  # Givens Rotations
+    # Upper Hessenberg matrix, which is then
+    #   converted to upper tri with Givens Rots
+    H = zeros((max_inner+1, max_inner), dtype=xtype, order='F')
+    V = zeros((dimen, max_inner+1), dtype=vtype, order='F')  # Krylov Space
+    Vflat = V.ravel(order='F')  # flat view of V for amg_core
+    # MGS coefficients are accumulated in vtype, then copied to H
+    if vtype != xtype:
+        hwork = zeros((max_inner+1,), dtype=vtype)
+    else:
+        hwork = None
+    # This is the RHS vector for the problem in the Krylov Space
+    g = zeros((max_inner+1,), dtype=xtype)
+    # Work vector for the update to x at each restart
+    update = zeros((dimen,), dtype=vtype)
+
     # Begin GMRES
     for outer in range(max_outer):
 
-        # Preallocate for Givens Rotations, Hessenberg matrix and Krylov Space
-        # Space required is O(dimen*max_inner).
-        # NOTE:  We are dealing with row-major matrices, so we traverse in a
-        #        row-major fashion,
-        #        i.e., H and V's transpose is what we store.
-        Q = []  # Givens Rotations
-        # Upper Hessenberg matrix, which is then
-        #   converted to upper tri with Givens Rots
-        H = zeros((max_inner+1, max_inner+1), dtype=xtype)
-        V = zeros((max_inner+1, dimen), dtype=xtype)  # Krylov Space
-        # vs store the pointers to each column of V.
-        #   This saves a considerable amount of time.
-        vs = []
-        # v = r/normr
-        V[0, :] = scal(1.0/normr, r)
-        vs.append(V[0, :])
-
-        # This is the RHS vector for the problem in the Krylov Space
-        g = zeros((dimen,), dtype=xtype)
+        # Reset for this restart.  Each column of V is overwritten before it is
+        # used, so V need not be zeroed.
+        if outer > 0:
+            Q[:] = 0.0
+            H[:] = 0.0
+            g[:] = 0.0
+
+        # v = r/normr, written directly into V
+        divide(r, normr, out=V[:, 0])
+
         g[0] = normr
 
         for inner in range(max_inner):
 
             # New Search Direction
-            v = V[inner+1, :]
-            v[:] = ravel(M*(A*vs[-1]))
-            vs.append(v)
-            normv_old = norm(v)
+            v = V[:, inner+1]
+            if precondition:
+                v[:] = ravel(M*(A*V[:, inner]))
+            else:
+                v[:] = ravel(A*V[:, inner])
+            if (reorth is True) and (not cgs):
+                normv_old = vnrm2(v)
 
             # Check for nan, inf
-            # if isnan(V[inner+1, :]).any() or isinf(V[inner+1, :]).any():
+            # if isnan(V[:, inner+1]).any() or isinf(V[:, inner+1]).any():
             #    warn('inf or nan after application of preconditioner')
             #    return(postprocess(x), -1)
 
-            #  Modified Gram Schmidt
-            for k in range(inner+1):
-                vk = vs[k]
-                alpha = dotc(vk, v)
-                H[inner, k] = alpha
-                v[:] = axpy(vk, v, dimen, -alpha)
-
-            normv = norm(v)
-            H[inner, inner+1] = normv
-
-            # Re-orthogonalize
-            if (reorth is True) and (normv_old == normv_old + 0.001*normv):
-                for k in range(inner+1):
-                    vk = vs[k]
-                    alpha = dotc(vk, v)
-                    H[inner, k] = H[inner, k] + alpha
-                    v[:] = axpy(vk, v, dimen, -alpha)
+            if cgs:
+                # Classical Gram Schmidt.  V[:, :inner+1] is Fortran
+                # contiguous, so that the projection V^H v and the update
+                # v - V h are each one gemv
+                Vk = V[:, :inner+1]
+                h = gemv(1.0, Vk, v, trans=2)
+                H[:inner+1, inner] = h
+                v[:] = gemv(-1.0, Vk, h, beta=1.0, y=v)
+            else:
+                #  Modified Gram Schmidt
+                if hwork is None:
+                    h = H[:, inner]
+                else:
+                    h = hwork
+                mgs_orthogonalize(Vflat, v, h, dimen, inner+1)
+
+            normv = vnrm2(v)
+            H[inner+1, inner] = normv
+
+            # Re-orthogonalize.  Classical Gram-Schmidt always takes a
+            # second pass (CGS2), because one pass loses orthogonality
+            # gradually, which the cancellation check below does not detect.
+            # Modified Gram-Schmidt is only re-orthogonalized on near total
+            # cancellation.
+            if reorth is True:
+                if cgs:
+                    h = gemv(1.0, Vk, v, trans=2)
+                    H[:inner+1, inner] += h
+                    v[:] = gemv(-1.0, Vk, h, beta=1.0, y=v)
+                    H[inner+1, inner] = vnrm2(v)
+                elif normv_old == normv_old + 0.001*normv:
+                    mgs_orthogonalize(Vflat, v, h, dimen, inner+1)
+                    H[inner+1, inner] = vnrm2(v)
+
+            if (not cgs) and (hwork is not None):
+                H[:inner+1, inner] = hwork[:inner+1]
+                hwork[:inner+1] = 0.0
 
             # Check for breakdown
-            if H[inner, inner+1] != 0.0:
-                v[:] = scal(1.0/H[inner, inner+1], v)
+            if H[inner+1, inner] != 0.0:
+                v[:] = vscal(1.0/H[inner+1, inner], v)
 
             # Apply previous Givens rotations to H
             if inner > 0:
-                apply_givens(Q, H[inner, :], inner)
+                apply_givens(Q, H[:, inner], max_inner+1, inner)
 
             # Calculate and apply next complex-valued Givens Rotation
             # ==> Note that if max_inner = dimen, then this is unnecessary
             # for the last inner
             #     iteration, when inner = dimen-1.
             if inner != dimen-1:
-                if H[inner, inner+1] != 0:
-                    [c, s, r] = lartg(H[inner, inner], H[inner, inner+1])
-                    Qblock = array([[c, s], [-conjugate(s), c]], dtype=xtype)
-                    Q.append(Qblock)
+                if H[inner+1, inner] != 0:
+                    # lartg returns the rotation [c, s; -conj(s), c] and
+                    # r, the rotated H[inner, inner]
+                    [c, s, r] = lartg(H[inner, inner], H[inner+1, inner])
+                    Q[(inner*4): ((inner+1)*4)] = [c, s, -conjugate(s), c]
 
                     # Apply Givens Rotation to g,
                     #   the RHS for the linear system in the Krylov Subspace.
-                    g[inner:inner+2] = sp.dot(Qblock, g[inner:inner+2])
+                    g0 = g[inner]
+                    g[inner] = c*g0 + s*g[inner+1]
+                    g[inner+1] = -conjugate(s)*g0 + c*g[inner+1]
 
                     # Apply effect of Givens Rotation to H
-                    H[inner, inner] = dotu(Qblock[0, :],
-                                           H[inner, inner:inner+2])
-                    H[inner, inner+1] = 0.0
+                    H[inner, inner] = r
+                    H[inner+1, inner] = 0.0
 
             niter += 1
 
@@ -333,14 +372,16 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
         # end inner loop, back to outer loop
 
         # Find best update to x in Krylov Space V.  Solve inner x inner system.
-        y = sp.linalg.solve(H[0:inner+1, 0:inner+1].T, g[0:inner+1])
-        update = ravel(sp.mat(V[:inner+1, :]).T*y.reshape(-1, 1))
-        x = x + update
+        # After the Givens Rotations, H is upper triangular
+        y = solve_triangular(H[0:inner+1, 0:inner+1], g[0:inner+1])
+        dot(V[:, :inner+1], y.astype(vtype, copy=False), out=update)
+        x += update
         r = b - ravel(A*x)
 
         # Apply preconditioner
-        r = ravel(M*r)
-        normr = norm(r)
+        if precondition:
+            r = ravel(M*r)
+        normr = nrm2(r)
         # Check for nan, inf
         # if isnan(r).any() or isinf(r).any():
         #    warn('inf or nan after application of preconditioner')
@@ -352,13 +393,12 @@ def gmres_mgs(A, b, x0=None, tol=1e-5, restrt=None, maxiter=None, xtype=None,
         if keep_r:
             residuals.append(normr)
 
-        # Has GMRES stagnated?
-        indices = (x != 0)
-        if indices.any():
-            change = max(abs(update[indices] / x[indices]))
-            if change < 1e-12:
-                # No change, halt
-                return (postprocess(x), -1)
+        # Has GMRES stagnated?  Compare the size of the update to x as a
+        # whole, which avoids the temporaries of an entrywise check
+        normx = nrm2(x)
+        if normx != 0.0 and vnrm2(update) < 1e-12*normx:
+            # No change, halt
+            return (postprocess(x), -1)
 
         # test for convergence
         if normr < tol:
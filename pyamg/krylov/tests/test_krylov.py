@@ -1,7 +1,7 @@
 from pyamg.krylov import bicgstab, cg, cgne, cgnr, cr, fgmres, gmres
 from pyamg.krylov._gmres_householder import gmres_householder
 from pyamg.krylov._gmres_mgs import gmres_mgs
-from numpy import array, zeros, ones
+from numpy import array, zeros, ones, float32
 from scipy import mat, random
 from scipy.linalg import solve
 from pyamg.util.linalg import norm
@@ -120,6 +120,23 @@ class TestKrylov(TestCase):
                            'different convergence flags for small matrix')
                 assert_equal(flag, flag2, err_msg=err_msg)
 
+                # Test agreement between MGS and CGS Gram-Schmidt
+                (x3, flag3) = gmres_mgs(A, b, x0=x0, maxiter=min(A.shape[0],
+                                        maxiter), cgs=True)
+                err_msg = ('MGS GMRES and CGS GMRES gave '
+                           'different results for small matrix')
+                assert_array_almost_equal(x2/norm(x2), x3/norm(x3),
+                                          err_msg=err_msg)
+                assert_equal(flag2, flag3, err_msg=err_msg)
+
+                # Test agreement with a single precision Krylov basis
+                (x4, flag4) = gmres_mgs(A, b, x0=x0, maxiter=min(A.shape[0],
+                                        maxiter), inner_dtype=float32)
+                err_msg = ('MGS GMRES with a single precision basis gave '
+                           'different results for small matrix')
+                assert_array_almost_equal(x2/norm(x2), x4/norm(x4),
+                                          decimal=4, err_msg=err_msg)
+
                 # Test agreement between GMRES and CR
                 if A_symm.shape[0] > 1:
                     residuals2 = []
@@ -142,6 +159,63 @@ class TestKrylov(TestCase):
                     assert_array_almost_equal(x2/norm(x2), x3/norm(x3),
                                               err_msg=err_msg)
 
+    def test_gmres_stagnation(self):
+        # For skew-symmetric A, r^T A r = 0, so GMRES(1) never updates x
+        A = mat(zeros((10, 10)))
+        for i in range(9):
+            A[i, i+1] = 1.0
+            A[i+1, i] = -1.0
+        b = ones((10, 1))
+        x0 = ones((10, 1))
+
+        for cgs in [False, True]:
+            residuals = []
+            (x, flag) = gmres_mgs(A, b, x0=x0, tol=1e-8, restrt=1,
+                                  maxiter=20, cgs=cgs, residuals=residuals)
+            err_msg = 'MGS GMRES did not report stagnation'
+            assert_equal(flag, -1, err_msg=err_msg)
+            assert_equal(len(residuals), 2, err_msg=err_msg)
+            assert_array_almost_equal(x, x0.ravel())
+
+    def test_gmres_complex_preconditioner(self):
+        # A real system with a complex preconditioner has complex updates
+        from scipy.sparse import diags
+        from pyamg.gallery import poisson
+        A = poisson((10, 10), format='csr')
+        M = diags((1.0 + 0.1j)/A.diagonal(), format='csr')
+        b = ones((A.shape[0],))
+        (x, flag) = gmres_mgs(A, b, M=M, tol=1e-8, maxiter=100)
+        err_msg = 'MGS GMRES failed with a complex preconditioner'
+        assert_equal(flag, 0, err_msg=err_msg)
+        assert_equal(norm(b - A*x) < 1e-6*norm(b), True, err_msg=err_msg)
+
+    def test_gmres_cgs_reorth(self):
+        # A clustered spectrum makes the Krylov basis ill-conditioned, so
+        # that one pass of classical Gram-Schmidt loses orthogonality.  The
+        # basis is recovered from the vectors that A is applied to.
+        from numpy import hstack, linspace, eye, vstack
+        from scipy.sparse import diags
+        from scipy.sparse.linalg import LinearOperator
+
+        n = 200
+        D = diags(hstack((1.0 + 1e-3*linspace(0, 1, n - 5),
+                          [2.0, 3.0, 4.0, 5.0, 6.0])), format='csr')
+        vs = []
+
+        def matvec(v):
+            vs.append(array(v).ravel())
+            return D*array(v).ravel()
+
+        A = LinearOperator((n, n), matvec=matvec, dtype=float)
+        gmres_mgs(A, ones((n,)), tol=1e-30, restrt=30, maxiter=1, cgs=True,
+                  reorth=True)
+
+        # the first and last products are with x, before and after the cycle
+        V = vstack(vs[1:-1]).T
+        err_msg = 'CGS GMRES with reorth=True lost orthogonality'
+        assert_equal(norm(eye(V.shape[1]) - V.T.dot(V)) < 1e-10, True,
+                     err_msg=err_msg)
+
     def test_krylov(self):
         # Oblique projectors reduce the residual
         for method in self.oblique:
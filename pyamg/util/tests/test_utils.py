@@ -249,6 +249,12 @@ class TestUtils(TestCase):
 
                     assert_array_almost_equal(x_linop, x_gold)
 
+                    # each column of a block of vectors is relaxed
+                    # independently
+                    X = hstack((x, 2.0*x))
+                    assert_array_almost_equal(relax*X,
+                                              hstack((x_gold, relax*(2.0*x))))
+
     def test_filter_operator(self):
         # Basic tests of dimension 1 and 2 problems
         # 1x1
@@ -1028,6 +1034,29 @@ class TestUtils(TestCase):
                        [0.,  0.,  0.,  0.]])
         assert_array_almost_equal(Acopy.todense(), exact)
 
+    def test_constant_candidates(self):
+        from pyamg.util.utils import constant_candidates, blocksize
+        import numpy as np
+        for A in [csr_matrix(np.eye(6)),
+                  bsr_matrix(np.eye(6), blocksize=(2, 2)),
+                  bsr_matrix(1.0j*np.eye(6), blocksize=(3, 3))]:
+            bs = blocksize(A)
+            B = constant_candidates(A)
+            assert_equal(B.dtype, A.dtype)
+            assert_equal(B, np.kron(np.ones((6 // bs, 1)), np.eye(bs)))
+
+    def test_hermitian_transpose(self):
+        from pyamg.util.utils import hermitian_transpose
+        import numpy as np
+        M = np.arange(16.0).reshape(4, 4)
+        for A in [csr_matrix(M), csr_matrix(M + 1.0j*M.T),
+                  bsr_matrix(M, blocksize=(2, 2)),
+                  bsr_matrix(M - 2.0j*M, blocksize=(2, 2))]:
+            AH = hermitian_transpose(A)
+            assert_equal(AH.format, A.format)
+            assert_equal(AH.dtype, A.dtype)
+            assert_equal(AH.todense(), A.todense().H)
+
 
 class TestComplexUtils(TestCase):
     def test_diag_sparse(self):
@@ -14,10 +14,11 @@ from pyamg.util.linalg import norm, cond, pinv_array
 from scipy.linalg import eigvals
 import pyamg.amg_core
 
-__all__ = ['unpack_arg', 'blocksize', 'diag_sparse', 'profile_solver', 
-           'to_type', 'type_prep', 'get_diagonal', 'UnAmal', 'Coord2RBM',
-           'hierarchy_spectrum', 'print_table', 'get_block_diag', 'amalgamate',
-           'symmetric_rescaling', 'symmetric_rescaling_sa',
+__all__ = ['unpack_arg', 'blocksize', 'constant_candidates',
+           'hermitian_transpose', 'diag_sparse', 'profile_solver', 'to_type',
+           'type_prep', 'get_diagonal', 'UnAmal',
+           'Coord2RBM', 'hierarchy_spectrum', 'print_table', 'get_block_diag',
+           'amalgamate', 'symmetric_rescaling', 'symmetric_rescaling_sa',
            'relaxation_as_linear_operator', 'filter_operator', 'scale_T',
            'get_Cpt_params', 'compute_BtBinv', 'eliminate_diag_dom_nodes',
            'levelize_strength_or_aggregation',
@@ -56,6 +57,69 @@ def blocksize(A):
         return 1
 
 
+def constant_candidates(A):
+    """Return the default near nullspace candidates for A, i.e., the constant
+    over each variable in a node
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Sparse NxN matrix
+
+    Returns
+    -------
+    B : {array}
+        N x blocksize(A) array of dtype A.dtype, equal to
+        np.kron(np.ones((N/blocksize(A), 1)), np.eye(blocksize(A)))
+
+    Examples
+    --------
+    >>> from pyamg.util.utils import constant_candidates
+    >>> from scipy.sparse import bsr_matrix
+    >>> import numpy as np
+    >>> A = bsr_matrix(np.eye(4), blocksize=(2, 2))
+    >>> constant_candidates(A)
+    array([[ 1.,  0.],
+           [ 0.,  1.],
+           [ 1.,  0.],
+           [ 0.,  1.]])
+    """
+    bs = blocksize(A)
+    if bs == 1:
+        return np.ones((A.shape[0], 1), dtype=A.dtype)
+    else:
+        return np.tile(np.eye(bs, dtype=A.dtype), (A.shape[0] // bs, 1))
+
+
+def hermitian_transpose(A):
+    """Return the conjugate transpose of A, in the sparse format of A
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Sparse matrix
+
+    Returns
+    -------
+    AH : {csr_matrix, bsr_matrix}
+        A.H, stored in the same format as A.  For real A, this is A.T, which
+        avoids the copy of A.data made by A.conj().
+
+    Examples
+    --------
+    >>> from pyamg.util.utils import hermitian_transpose
+    >>> from scipy.sparse import csr_matrix
+    >>> A = csr_matrix([[1., 2.], [0., 3.]])
+    >>> hermitian_transpose(A).todense()
+    matrix([[ 1.,  0.],
+            [ 2.,  3.]])
+    """
+    if A.dtype.kind == 'c':
+        return A.H.asformat(A.format)
+    else:
+        return A.T.asformat(A.format)
+
+
 def profile_solver(ml, accel=None, **kwargs):
     """
     A quick solver to profile a particular multilevel object
@@ -1286,6 +1350,48 @@ def relaxation_as_linear_operator(method, A, b, cost=[0.0]):
         relax(A, xcopy, b)
         return xcopy
 
+    # Point and block Jacobi are applied to all columns of a block of vectors
+    # at once, so that A is traversed once per iteration, instead of once per
+    # column and iteration
+    if fn == 'block_jacobi':
+        bs = kwargs.get('blocksize', None)
+        if bs is None:
+            if kwargs.get('Dinv', None) is not None:
+                bs = kwargs['Dinv'].shape[1]
+            else:
+                bs = blocksize(A)
+        if bs == 1:
+            fn = 'jacobi'
+
+    if (fn == 'jacobi' or fn == 'block_jacobi') and\
+            (isspmatrix_csr(A) or isspmatrix_bsr(A)):
+        from pyamg.relaxation.smoothing import rho_D_inv_A,\
+            rho_block_D_inv_A, DEFAULT_NITER
+        omega = kwargs.get('omega', 1.0)
+        iterations = kwargs.get('iterations', DEFAULT_NITER)
+        if fn == 'jacobi':
+            if kwargs.get('withrho', True):
+                omega = omega/rho_D_inv_A(A)
+            D_inv = get_diagonal(A, inv=True).reshape(-1, 1)
+        else:
+            Dinv = kwargs.get('Dinv', None)
+            if Dinv is None:
+                Dinv = get_block_diag(A, blocksize=bs, inv_flag=True)
+            if kwargs.get('withrho', True):
+                omega = omega/rho_block_D_inv_A(A, Dinv)
+            nblocks = Dinv.shape[0]
+            D_inv = bsr_matrix((Dinv, np.arange(nblocks),
+                                np.arange(nblocks + 1)), shape=A.shape)
+        bcol = b.reshape(A.shape[0], -1)
+
+        def matmat(X):
+            X = np.array(X, dtype=A.dtype)
+            for i in range(iterations):
+                X += omega*(D_inv*(bcol - A*X))
+            return X
+
+        return LinearOperator(A.shape, matvec, matmat=matmat, dtype=A.dtype)
+
     return LinearOperator(A.shape, matvec, dtype=A.dtype)
 
 